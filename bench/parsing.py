@@ -0,0 +1,105 @@
+"""
+Decode + parse cost of a single trending refresh, old path vs `schema`.
+
+    $ uv run bench/parsing.py
+"""
+
+import json
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import schema  # noqa: E402
+
+ROUNDS = 2000
+
+
+def trending_payload(size: int = 20) -> bytes:
+    results = [
+        {
+            "adult": False,
+            "backdrop_path": f"/backdrop{i}.jpg",
+            "id": 1000 + i,
+            "title": f"Фільм номер {i}",
+            "original_title": f"Movie number {i}",
+            "overview": "Опис фільму, який займає кілька речень. " * 8,
+            "poster_path": f"/poster{i}.jpg",
+            "media_type": "movie",
+            "original_language": "en",
+            "genre_ids": [28, 12, 878],
+            "popularity": 123.456 + i,
+            "release_date": f"2024-0{1 + i % 9}-1{i % 10}",
+            "video": False,
+            "vote_average": 7.3,
+            "vote_count": 1500 + i,
+        }
+        for i in range(size)
+    ]
+    return json.dumps(
+        {"page": 1, "results": results, "total_pages": 500, "total_results": 10000},
+        ensure_ascii=False,
+    ).encode()
+
+
+def old_path(raw: bytes) -> list[dict[str, Any]]:
+    movies = []
+    # what resp.json() did: decode the body to `str`, then the stdlib decoder
+    for movie in json.loads(raw.decode())["results"]:
+        if poster_path := movie.get("poster_path"):
+            movie["poster_path"] = schema.TMDB_IMAGE_ENDPOINT.format(poster_path)
+        else:
+            movie["poster_path"] = schema.POSTER_PLACEHOLDER_PATH
+        movies.append(
+            {
+                "title": movie.get("title") or movie["original_title"],
+                "original_title": movie.get("original_title") or movie["title"],
+                "trailer": movie.get("trailer") or "",
+                "overview": movie.get("overview") or "",
+                "poster_path": movie["poster_path"],
+                "genre_ids": movie.get("genre_ids") or [],
+                "release_date": datetime.strptime(
+                    movie.get("release_date") or "1970-01-01", "%Y-%m-%d"
+                ),
+                "average_rating": movie.get("vote_average") or 0.0,
+                "vote_count": movie.get("vote_count") or 0,
+            }
+        )
+    return movies
+
+
+def new_path(raw: bytes) -> list[schema.MovieData]:
+    return [
+        movie
+        for r in schema.loads(raw)["results"]
+        if (movie := schema.MovieData.parse(r))
+    ]
+
+
+def memory(fn, raw: bytes) -> tuple[int, int]:
+    fn(raw)  # orjson allocates its key cache on first use
+    tracemalloc.start()
+    result = fn(raw)  # noqa: F841, kept alive to count what a refresh retains
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, peak
+
+
+def main() -> None:
+    raw = trending_payload()
+    print(f"decoder: {schema.loads.__module__}, payload: {len(raw)} bytes")
+    for name, fn in (("old", old_path), ("new", new_path)):
+        per_call = timeit.timeit(lambda: fn(raw), number=ROUNDS) / ROUNDS
+        retained, peak = memory(fn, raw)
+        print(
+            f"{name}: {per_call * 1e6:8.1f} us/refresh, "
+            f"retained {retained / 1024:6.1f} KiB, peak {peak / 1024:6.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
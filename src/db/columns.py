@@ -0,0 +1,28 @@
+from tortoise import Tortoise
+from tortoise.exceptions import OperationalError
+
+from schema import DEFAULT_LANGUAGE
+
+# `generate_schemas` only creates missing tables, so columns added to existing
+# models have to be added to databases created before them by hand
+ADDED_COLUMNS = (
+    # a constant default, so old rows count as stale for the refresher
+    ("movie", "updated_at", "TIMESTAMP NOT NULL DEFAULT '1970-01-01 00:00:00'"),
+    ("user", "language", f"VARCHAR(8) NOT NULL DEFAULT '{DEFAULT_LANGUAGE}'"),
+    # empty until refreshed, `Movie.localize` keeps the row's poster meanwhile
+    ("movietranslation", "poster_path", "VARCHAR(256) NOT NULL DEFAULT ''"),
+)
+
+
+async def add_missing_columns() -> None:
+    connection = Tortoise.get_connection("default")
+    for table, column, definition in ADDED_COLUMNS:
+        try:
+            # qualified, or sqlite reads an unknown "column" as a string literal
+            await connection.execute_query(
+                f'SELECT "{table}"."{column}" FROM "{table}" LIMIT 1'
+            )
+        except OperationalError:
+            await connection.execute_script(
+                f'ALTER TABLE "{table}" ADD COLUMN "{column}" {definition}'
+            )
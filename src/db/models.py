@@ -1,10 +1,11 @@
-from datetime import datetime
-from typing import Any
+from collections.abc import Iterable
 
 from cachetools import LRUCache, TTLCache
 from tortoise import fields
 from tortoise.models import Model
 
+from schema import DEFAULT_LANGUAGE, MovieData
+
 
 class Movie(Model):
     id = fields.IntField(primary_key=True)
@@ -17,33 +18,92 @@ class Movie(Model):
     release_date = fields.DateField()
     average_rating = fields.FloatField()
     vote_count = fields.IntField()
+    updated_at = fields.DatetimeField(auto_now=True)
 
     query_lookup_cache = TTLCache(maxsize=1024, ttl=600)
     id_lookup_cache = TTLCache(maxsize=1024, ttl=600)
-    currently_trending_cache = TTLCache(maxsize=1, ttl=600)
+    currently_trending_cache = TTLCache(maxsize=8, ttl=600)
 
     @staticmethod
-    async def from_dict(data: dict[str, Any], save: bool = True) -> "Movie":
+    async def from_data(data: MovieData, save: bool = True) -> "Movie":
         defaults = {
-            "title": data.get("title") or data["original_title"],
-            "original_title": data.get("original_title") or data["title"],
-            "trailer": data.get("trailer") or "",
-            "overview": data.get("overview") or "опис не знайдено.",
-            "poster_path": data["poster_path"],
-            "genre_ids": data.get("genre_ids") or [],
-            "release_date": datetime.strptime(
-                data.get("release_date") or "1970-01-01", "%Y-%m-%d"
-            ),
-            "average_rating": data.get("vote_average") or 0.0,
-            "vote_count": data.get("vote_count") or 0,
+            "title": data.title,
+            "original_title": data.original_title,
+            "trailer": data.trailer,
+            "overview": data.overview or "опис не знайдено.",
+            "poster_path": data.poster_path,
+            "genre_ids": data.genre_ids,
+            "release_date": data.release_date,
+            "average_rating": data.vote_average,
+            "vote_count": data.vote_count,
         }
         if save:  #  kwargs are for unique keys, everything else is `defaults`
-            return (await Movie.update_or_create(defaults=defaults, id=data["id"]))[0]
-        return Movie(**({"id": data["id"]} | defaults))
+            return (await Movie.update_or_create(defaults=defaults, id=data.id))[0]
+        return Movie(**({"id": data.id} | defaults))
+
+    async def save_trailer(self, language: str) -> None:
+        await self.save(update_fields=("trailer",), force_update=True)
+        await MovieTranslation.filter(movie_id=self.id, language=language).update(
+            trailer=self.trailer
+        )
+
+    @staticmethod
+    async def localize(movies: list["Movie"], language: str) -> list["Movie"]:
+        # the row itself holds whichever language wrote it last
+        translations = {
+            translation.movie_id: translation
+            for translation in await MovieTranslation.filter(
+                movie_id__in=[movie.id for movie in movies], language=language
+            )
+        }
+        for movie in movies:
+            if translation := translations.get(movie.id):
+                movie.title = translation.title
+                movie.overview = translation.overview
+                movie.trailer = translation.trailer
+                movie.poster_path = translation.poster_path or movie.poster_path
+        return movies
+
+
+TRANSLATED_FIELDS = ("title", "overview", "trailer", "poster_path")
+
+
+class MovieTranslation(Model):
+    id = fields.IntField(primary_key=True)
+    movie: fields.ForeignKeyRelation[Movie] = fields.ForeignKeyField(
+        "models.Movie", related_name="translations"
+    )
+    movie_id: int
+    language = fields.CharField(max_length=8)
+    title = fields.CharField(max_length=256)
+    overview = fields.TextField()
+    trailer = fields.CharField(max_length=256)
+    poster_path = fields.CharField(max_length=256)
+
+    class Meta:
+        unique_together = (("movie", "language"),)
+
+    @staticmethod
+    async def upsert(translations: Iterable[tuple[Movie, str]]) -> None:
+        objects = [
+            MovieTranslation(
+                movie_id=movie.id,
+                language=language,
+                **{field: getattr(movie, field) for field in TRANSLATED_FIELDS},
+            )
+            for movie, language in translations
+        ]
+        if objects:
+            await MovieTranslation.bulk_create(
+                objects,
+                on_conflict=("movie_id", "language"),
+                update_fields=TRANSLATED_FIELDS,
+            )
 
 
 class User(Model):
     id = fields.IntField(primary_key=True)
+    language = fields.CharField(max_length=8, default=DEFAULT_LANGUAGE)
     favourites = fields.ManyToManyField(
         "models.Movie", related_name="favourite_of", through="user_favourites"
     )
@@ -53,7 +113,15 @@ class User(Model):
 
     last_trending_cache = LRUCache(maxsize=1024)
     favourites_cache = LRUCache(maxsize=1024)
+    language_cache = LRUCache(maxsize=1024)
 
     @staticmethod
     async def by_id(user_id: int) -> "User":
         return (await User.get_or_create(id=user_id))[0]
+
+    @staticmethod
+    async def language_of(user_id: int) -> str:
+        if not (language := User.language_cache.get(user_id)):
+            language = (await User.by_id(user_id)).language
+            User.language_cache[user_id] = language
+        return language
@@ -1,6 +1,8 @@
+import asyncio
 import contextlib
 import logging
 import os
+from pathlib import Path
 
 import aiogram
 import dotenv
@@ -11,7 +13,10 @@ from rich.logging import RichHandler
 from tortoise import Tortoise, run_async
 
 import routers
+from db.columns import add_missing_columns
+from refresh import MovieRefresher
 from tmdb import TMDBSession
+from tracing import setup_tracing, slow_update_log
 
 dotenv.load_dotenv()
 
@@ -36,13 +41,31 @@ async def main() -> None:
     db_url = expect_env("DB_URL")
     await Tortoise.init(db_url=db_url, modules={"models": ["db.models"]})
     await Tortoise.generate_schemas()
+    await add_missing_columns()
 
     dp = Dispatcher(tmdb=tmdb)
     dp.include_routers(*[getattr(routers, r) for r in routers.__all__])
 
+    slow_threshold = os.getenv("TRACE_SLOW_MS")
+    profile_rate = float(os.getenv("TRACE_PROFILE_RATE") or 0)
+    if slow_threshold or profile_rate:
+        setup_tracing(
+            dp,
+            bot,
+            slow_threshold=float(slow_threshold or "inf"),
+            profile_rate=profile_rate,
+            profile_dir=Path(os.getenv("TRACE_PROFILE_DIR") or "profiles"),
+        )
+
+    refresher = MovieRefresher(tmdb)
+    refresh_task = asyncio.create_task(refresher.run())
+
     await bot.delete_webhook(drop_pending_updates=True)
 
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        refresh_task.cancel()
 
 
 if __name__ == "__main__":
@@ -54,6 +77,8 @@ if __name__ == "__main__":
         ],
     )
     loggers.event.setLevel(logging.WARNING)
+    if slow_log_path := os.getenv("TRACE_SLOW_LOG"):
+        slow_update_log.addHandler(logging.FileHandler(slow_log_path))
 
     with contextlib.suppress(KeyboardInterrupt):
         run_async(main())
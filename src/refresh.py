@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+import aiohttp
+from tortoise import timezone
+from tortoise.functions import Count
+
+from db.models import Movie, MovieTranslation, User
+from tmdb import TMDBException, TMDBSession
+
+REFRESH_INTERVAL = timedelta(minutes=30)
+REFRESH_MAX_AGE = timedelta(days=1)
+REFRESH_BATCH_SIZE = 100
+REFRESH_CONCURRENCY = 8
+
+REFRESHED_FIELDS = (
+    "title",
+    "original_title",
+    "trailer",
+    "overview",
+    "poster_path",
+    "genre_ids",
+    "release_date",
+    "average_rating",
+    "vote_count",
+    "updated_at",
+)
+
+
+class MovieRefresher:
+    def __init__(
+        self,
+        tmdb: TMDBSession,
+        *,
+        interval: timedelta = REFRESH_INTERVAL,
+        max_age: timedelta = REFRESH_MAX_AGE,
+        batch_size: int = REFRESH_BATCH_SIZE,
+        concurrency: int = REFRESH_CONCURRENCY,
+    ) -> None:
+        self.tmdb = tmdb
+        self.interval = interval
+        self.max_age = max_age
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+
+    async def stale_favourites(self) -> list[Movie]:
+        cutoff = timezone.now() - self.max_age
+        return (
+            await Movie.annotate(favourite_count=Count("favourite_of"))
+            .filter(favourite_count__gt=0, updated_at__lt=cutoff)
+            .order_by("-favourite_count", "updated_at")
+            .limit(self.batch_size)
+        )
+
+    async def refresh_once(self) -> int:
+        stale = {movie.id: movie for movie in await self.stale_favourites()}
+        if not stale:
+            return 0
+
+        # every movie is refetched in the languages of the users holding it
+        holders = await User.filter(favourites__id__in=list(stale)).values_list(
+            "id", "favourites__id", "language"
+        )
+        user_languages = {user_id: language for user_id, _, language in holders}
+        variants = sorted({(movie_id, lang) for _, movie_id, lang in holders})
+        trailers = {
+            (translation.movie_id, translation.language): translation.trailer
+            for translation in await MovieTranslation.filter(movie_id__in=list(stale))
+        }
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # set on the first transient upstream error, so the rest of the batch
+        # waits for the next pass instead of hammering an API that's already
+        # refusing us
+        backoff = asyncio.Event()
+        # movies that got an answer, even a 404 or an error that won't go away,
+        # so they don't stay at the top of the queue until they're fixed
+        checked: set[int] = set()
+
+        async def fetch(movie_id: int, language: str) -> Movie | None:
+            async with semaphore:
+                if backoff.is_set():
+                    return None
+                try:
+                    fresh = await self.tmdb.get_movie_by_id(movie_id, language)
+                except (TimeoutError, TMDBException, aiohttp.ClientError) as e:
+                    logging.warning("Refresh of movie %d failed: %r", movie_id, e)
+                    if isinstance(e, TMDBException) and not e.is_transient:
+                        checked.add(movie_id)
+                    else:
+                        backoff.set()
+                    return None
+
+            checked.add(movie_id)
+            if not fresh:
+                return None
+            fresh.trailer = (
+                fresh.trailer
+                or trailers.get((movie_id, language))
+                or stale[movie_id].trailer
+            )
+            fresh.updated_at = timezone.now()
+            return fresh
+
+        results = await asyncio.gather(*(fetch(*variant) for variant in variants))
+        refreshed = {
+            variant: movie
+            for variant, movie in zip(variants, results, strict=True)
+            if movie is not None
+        }
+        # the row keeps one of the variants, what users see comes from the
+        # translation in their language
+        rows = {movie.id: movie for movie in refreshed.values()}
+
+        if unchanged := checked - rows.keys():
+            await Movie.filter(id__in=list(unchanged)).update(updated_at=timezone.now())
+        if not refreshed:
+            return 0
+
+        await Movie.bulk_update(list(rows.values()), fields=REFRESHED_FIELDS)
+        await MovieTranslation.upsert(
+            (movie, language) for (_, language), movie in refreshed.items()
+        )
+
+        for variant, movie in refreshed.items():
+            if variant in Movie.id_lookup_cache:
+                Movie.id_lookup_cache[variant] = movie
+        for user_id, movies in User.favourites_cache.items():
+            if (language := user_languages.get(user_id)) is None:
+                continue
+            movies[:] = [refreshed.get((m.id, language), m) for m in movies]
+
+        logging.info("Refreshed %d/%d stale favourite movies", len(rows), len(stale))
+        return len(rows)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.refresh_once()
+            except Exception:
+                logging.exception("Favourites refresh pass failed")
+            await asyncio.sleep(self.interval.total_seconds())
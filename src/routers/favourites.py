@@ -32,7 +32,9 @@ async def favourites_handler(message: Message):
     if not (movies := User.favourites_cache.get(user_id)):
         db_user = await User.by_id(user_id)
         await db_user.fetch_related("favourites")
-        movies = await db_user.favourites.all()
+        movies = await Movie.localize(
+            await db_user.favourites.all(), await User.language_of(user_id)
+        )
         User.favourites_cache[user_id] = movies
 
     if not movies:
@@ -69,13 +71,16 @@ async def favourite_callback_handler(
     movie_id = callback_data.movie_id
 
     db_user = await User.by_id(user_id)
+    language = await User.language_of(user_id)
 
     if not (cached_movies := User.favourites_cache.get(user_id)):
         await db_user.fetch_related("favourites")
-        User.favourites_cache[user_id] = cached_movies = await db_user.favourites.all()
+        User.favourites_cache[user_id] = cached_movies = await Movie.localize(
+            await db_user.favourites.all(), language
+        )
 
     already_favourite = movie_id in [m.id for m in cached_movies]
-    movie = await Movie.get(id=movie_id)
+    (movie,) = await Movie.localize([await Movie.get(id=movie_id)], language)
 
     if already_favourite:
         await db_user.favourites.remove(movie)
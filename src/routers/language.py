@@ -0,0 +1,65 @@
+from aiogram import F, Router
+from aiogram.filters import Command
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+
+from db.models import User
+from schema import SUPPORTED_LANGUAGES
+
+router = Router(name="LANGUAGE")
+
+
+class LanguageCallback(CallbackData, prefix="language"):
+    language: str
+
+
+LANGUAGE_MARKUP = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text=name, callback_data=LanguageCallback(language=language).pack()
+            )
+            for language, name in SUPPORTED_LANGUAGES.items()
+        ]
+    ]
+)
+
+
+@router.message(Command("language", "lang"), F.from_user)
+async def language_handler(message: Message):
+    assert message.from_user is not None
+
+    language = await User.language_of(message.from_user.id)
+    await message.reply(
+        (
+            "🌐 Оберіть мову описів фільмів.\n"
+            f"Поточна мова: {SUPPORTED_LANGUAGES.get(language, language)}"
+        ),
+        reply_markup=LANGUAGE_MARKUP,
+    )
+
+
+@router.callback_query(LanguageCallback.filter())
+async def language_callback_handler(
+    query: CallbackQuery, callback_data: LanguageCallback
+):
+    language = callback_data.language
+    if language not in SUPPORTED_LANGUAGES:
+        await query.answer("💢 Ця мова не підтримується!")
+        return
+
+    user_id = query.from_user.id
+    db_user = await User.by_id(user_id)
+    db_user.language = language
+    await db_user.save(update_fields=("language",))
+    User.language_cache[user_id] = language
+    # both hold movies in the previous language
+    User.favourites_cache.pop(user_id, None)
+    User.last_trending_cache.pop(user_id, None)
+
+    await query.answer(f"🌐 Мову змінено: {SUPPORTED_LANGUAGES[language]}")
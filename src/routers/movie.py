@@ -25,7 +25,7 @@ from .start import SPECIAL_SEARCH_TEXT, SPECIAL_TRENDING_TEXT, START_MARKUP
 router = Router(name="MOVIE")
 
 
-def format_movie(movie: Movie) -> str:
+def format_movie(movie: Movie, language: str) -> str:
     MOVIE_FORMAT_STR = """
 <b>Назва фільму</b>: {title}
 {trailer}
@@ -44,7 +44,8 @@ def format_movie(movie: Movie) -> str:
     )
     genres = list(
         filter(
-            lambda g: g, [TMDBSession.genre_name_of(id, "") for id in movie.genre_ids]
+            lambda g: g,
+            [TMDBSession.genre_name_of(id, "", language) for id in movie.genre_ids],
         )
     )
     return MOVIE_FORMAT_STR.format(
@@ -70,20 +71,22 @@ async def search_handler(message: Message, state: FSMContext) -> None:
     await message.reply("🔎 Уведіть назву фільму:", reply_markup=markup)
 
 
-@router.message(SearchState.query, F.text)
+@router.message(SearchState.query, F.text, F.from_user)
 async def search_process_query(
     message: Message, state: FSMContext, tmdb: TMDBSession
 ) -> None:
     assert message.text is not None
+    assert message.from_user is not None
 
     await state.clear()
 
     markup = START_MARKUP if message.chat.type == "private" else ReplyKeyboardRemove()
 
     query = message.text.lower()
-    if not (movie := Movie.query_lookup_cache.get(query)):
-        movie = await tmdb.search_movie(query)
-        Movie.query_lookup_cache[query] = movie
+    language = await User.language_of(message.from_user.id)
+    if not (movie := Movie.query_lookup_cache.get((query, language))):
+        movie = await tmdb.search_movie(query, language=language)
+        Movie.query_lookup_cache[query, language] = movie
 
     if not movie:
         await message.reply(
@@ -92,16 +95,19 @@ async def search_process_query(
         return
     await message.reply_photo(
         movie.poster_path,
-        format_movie(movie),
+        format_movie(movie, language),
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[[favourite_button(movie.id)]]
         ),
     )
 
 
-@router.message(F.text.casefold().startswith("/view_") & F.text.len() > len("/view_"))
+@router.message(
+    F.text.casefold().startswith("/view_") & F.text.len() > len("/view_"), F.from_user
+)
 async def view_handler(message: Message, tmdb: TMDBSession):
     assert message.text is not None
+    assert message.from_user is not None
 
     command_split = message.text.split("_")
     assert len(command_split) > 1
@@ -118,9 +124,10 @@ async def view_handler(message: Message, tmdb: TMDBSession):
 
     markup = START_MARKUP if message.chat.type == "private" else None
 
-    if not (cached_movie := Movie.id_lookup_cache.get(movie_id)):
-        cached_movie = await tmdb.get_movie_by_id(movie_id)
-        Movie.id_lookup_cache[movie_id] = cached_movie
+    language = await User.language_of(message.from_user.id)
+    if not (cached_movie := Movie.id_lookup_cache.get((movie_id, language))):
+        cached_movie = await tmdb.get_movie_by_id(movie_id, language)
+        Movie.id_lookup_cache[movie_id, language] = cached_movie
 
     if not cached_movie:
         await message.reply("🔎 Фільму за цим параметром не знайдено")
@@ -128,7 +135,7 @@ async def view_handler(message: Message, tmdb: TMDBSession):
 
     await message.reply_photo(
         cached_movie.poster_path,
-        format_movie(cached_movie),
+        format_movie(cached_movie, language),
         reply_markup=markup,
     )
 
@@ -170,34 +177,33 @@ def paginator_markup(current_index: int, movie_id: int):
 async def trending_handler(message: Message, tmdb: TMDBSession):
     assert message.from_user is not None
 
-    if not (movies := Movie.currently_trending_cache.get(0)):
-        movies = await tmdb.get_trending_movies(time_window="week")
-        Movie.currently_trending_cache[0] = movies
+    user_id = message.from_user.id
+    language = await User.language_of(user_id)
+    if not (movies := Movie.currently_trending_cache.get(language)):
+        movies = await tmdb.get_trending_movies(time_window="week", language=language)
+        Movie.currently_trending_cache[language] = movies
 
     if not movies:
         await message.reply(
-            (
-                "💢 Помилка під час отримання списку фільмів.\n"
-                "Спробуйте ще раз через кілька секунд"
-            )
+            "💢 Помилка під час отримання списку фільмів.\n"
+            "Спробуйте ще раз через кілька секунд"
         )
         return
 
     movie = movies[0]
     if not movie.trailer:
-        trailer = await tmdb.get_movie_trailer(movie.id)
+        trailer = await tmdb.get_movie_trailer(movie.id, language)
         if trailer:
             movie.trailer = trailer
-            await movie.save(update_fields=("trailer",), force_update=True)
-            Movie.currently_trending_cache[0][0].trailer = trailer
+            await movie.save_trailer(language)
+            Movie.currently_trending_cache[language][0].trailer = trailer
 
     await message.reply_photo(
         movie.poster_path,
-        format_movie(movie),
+        format_movie(movie, language),
         reply_markup=paginator_markup(0, movie.id),
     )
 
-    user_id = message.from_user.id
     User.last_trending_cache[user_id] = movies
 
     db_user = await User.by_id(user_id)
@@ -216,13 +222,14 @@ async def paginator_callback_handler(
         return
 
     user_id = query.from_user.id
+    language = await User.language_of(user_id)
 
     if not (cached_movies := User.last_trending_cache.get(user_id)):
         db_user = await User.by_id(user_id)
         await db_user.fetch_related("last_trending")
-        User.last_trending_cache[user_id] = (
-            cached_movies
-        ) = await db_user.last_trending.all()
+        User.last_trending_cache[user_id] = cached_movies = await Movie.localize(
+            await db_user.last_trending.all(), language
+        )
 
     if not cached_movies:
         await query.answer("💢 Список фільмів не знайдено!")
@@ -233,20 +240,19 @@ async def paginator_callback_handler(
     current_index %= len(cached_movies)
 
     movie = cached_movies[current_index]
-    # PERF: when has no available trailer, makes requests repeatedly
     if not movie.trailer:
-        if trailer := await tmdb.get_movie_trailer(movie.id):
+        if trailer := await tmdb.get_movie_trailer(movie.id, language):
             movie.trailer = trailer
-            await movie.save(update_fields=("trailer",), force_update=True)
-            if Movie.currently_trending_cache:
-                Movie.currently_trending_cache[0][current_index].trailer = trailer
+            await movie.save_trailer(language)
+            if trending := Movie.currently_trending_cache.get(language):
+                trending[current_index].trailer = trailer
             User.last_trending_cache[user_id][current_index].trailer = trailer
 
     await query.message.edit_media(
         InputMediaPhoto(media=movie.poster_path),
     )
     await query.message.edit_caption(
-        caption=format_movie(movie),
+        caption=format_movie(movie, language),
         reply_markup=paginator_markup(current_index, movie.id),
     )
     await query.answer()
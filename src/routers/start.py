@@ -47,5 +47,6 @@ async def help_handler(message: Message):
 /search
 /trending
 /favourites
+/language
     """
     await message.reply(HELP_MESSAGE_TEXT)
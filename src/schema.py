@@ -0,0 +1,118 @@
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+try:
+    import orjson
+
+    loads: Callable[[str | bytes], Any] = orjson.loads
+except ImportError:
+    loads = json.loads
+
+DEFAULT_LANGUAGE = "uk-UA"
+FALLBACK_LANGUAGE = "en-US"
+SUPPORTED_LANGUAGES = {
+    "uk-UA": "🇺🇦 Українська",
+    "en-US": "🇺🇸 English",
+}
+
+TMDB_IMAGE_ENDPOINT = "https://image.tmdb.org/t/p/original/{}"
+POSTER_PLACEHOLDER_PATH = "https://placehold.co/550x825"
+
+EPOCH = date(1970, 1, 1)
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _str(value: Any) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def parse_date(value: Any) -> date:
+    if not value or not isinstance(value, str):
+        return EPOCH
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return EPOCH
+
+
+def parse_trailer(results: Any, language: str | None = None) -> str | None:
+    if not results or not isinstance(results, list):
+        return None
+
+    # videos are tagged with the bare ISO 639-1 code, "uk" for "uk-UA"
+    video_language = language.split("-")[0] if language else None
+
+    best: dict[str, Any] | None = None
+    best_size = -1
+    for video in results:
+        if not (
+            isinstance(video, dict)
+            and video.get("official")
+            and (video.get("type") or "").lower() == "trailer"
+            and (video.get("site") or "").lower() == "youtube"
+            and (not video_language or video.get("iso_639_1") == video_language)
+        ):
+            continue
+        if (size := video.get("size") or 0) > best_size:
+            best, best_size = video, size
+
+    if not best or not (key := best.get("key")):
+        return None
+    return f"https://youtube.com/watch?v={key}"
+
+
+@dataclass(slots=True)
+class MovieData:
+    id: int
+    title: str
+    original_title: str
+    overview: str
+    poster_path: str
+    genre_ids: list[int]
+    release_date: date
+    vote_average: float
+    vote_count: int
+    trailer: str = ""
+
+    @staticmethod
+    def parse(data: dict[str, Any]) -> "MovieData | None":
+        get = data.get
+        id = get("id")
+        title = _str(get("title")) or _str(get("original_title"))
+        if not _is_int(id) or not title:
+            return None
+
+        if (genre_ids := get("genre_ids")) is None:
+            genres = get("genres")
+            genre_ids = [
+                g.get("id")
+                for g in (genres if isinstance(genres, list) else ())
+                if isinstance(g, dict)
+            ]
+        if not isinstance(genre_ids, list):
+            genre_ids = []
+
+        vote_average = get("vote_average")
+        vote_count = get("vote_count")
+        poster_path = _str(get("poster_path"))
+        return MovieData(
+            id=id,
+            title=title,
+            original_title=_str(get("original_title")) or title,
+            overview=_str(get("overview")),
+            poster_path=TMDB_IMAGE_ENDPOINT.format(poster_path)
+            if poster_path
+            else POSTER_PLACEHOLDER_PATH,
+            genre_ids=[genre_id for genre_id in genre_ids if _is_int(genre_id)],
+            release_date=parse_date(get("release_date")),
+            vote_average=float(vote_average)
+            if _is_int(vote_average) or isinstance(vote_average, float)
+            else 0.0,
+            vote_count=vote_count if _is_int(vote_count) else 0,
+        )
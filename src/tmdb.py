@@ -1,142 +1,185 @@
+import asyncio
 import logging
 from typing import Any, Literal
 
 import aiohttp
 from aiohttp.client import ClientTimeout
-
-from db.models import Movie
+from cachetools import TTLCache
+
+from db.models import Movie, MovieTranslation
+from schema import (
+    DEFAULT_LANGUAGE,
+    FALLBACK_LANGUAGE,
+    SUPPORTED_LANGUAGES,
+    MovieData,
+    loads,
+    parse_trailer,
+)
+from tracing import span
 
 SESSION_TIMEOUT = ClientTimeout(total=10)
-DEFAULT_LANGUAGE = "uk-UA"
 
 TMDB_SEARCH_ENDPOINT = "https://api.themoviedb.org/3/search/movie"
 TMDB_TRENDING_ENDPOINT = "https://api.themoviedb.org/3/trending/movie/{}"
 TMDB_DETAILS_ENDPOINT = "https://api.themoviedb.org/3/movie/{}"
 TMDB_VIDEOS_ENDPOINT = "https://api.themoviedb.org/3/movie/{}/videos"
 TMDB_GENRE_LIST_ENDPOINT = "https://api.themoviedb.org/3/genre/movie/list"
-TMDB_IMAGE_ENDPOINT = "https://image.tmdb.org/t/p/original/{}"
-
-POSTER_PLACEHOLDER_PATH = "https://placehold.co/550x825"
 
 
 class TMDBException(Exception):
-    def __init__(self, tmdb_status: int | None, message: str | None) -> None:
+    def __init__(
+        self,
+        tmdb_status: int | None,
+        message: str | None,
+        http_status: int | None = None,
+    ) -> None:
         self.tmdb_status = tmdb_status
         self.message = message
+        self.http_status = http_status
+
+    @property
+    def is_transient(self) -> bool:
+        # rate limited or TMDB-side failures, a 4xx fails the same way next time
+        return self.http_status is None or (
+            self.http_status == 429 or self.http_status >= 500
+        )
 
 
 class TMDBSession:
-    __genres_table: dict[int, str] = {}
+    # language -> genre id -> genre name
+    __genres_table: dict[str, dict[int, str]] = {}
+    # (movie id, requested language) -> language the trailer was found in,
+    # or `None` if neither the requested nor the fallback language has one
+    trailer_language_memo = TTLCache(maxsize=4096, ttl=24 * 60 * 60)
 
     def __init__(self, api_token: str) -> None:
         self.__token = api_token
         self.__session = aiohttp.ClientSession(timeout=SESSION_TIMEOUT)
 
     @staticmethod
-    def genre_name_of(id: int, default: Any) -> str | Any:
-        return TMDBSession.__genres_table.get(id, default)
+    def genre_name_of(
+        id: int, default: Any, language: str = DEFAULT_LANGUAGE
+    ) -> str | Any:
+        return TMDBSession.__genres_table.get(language, {}).get(id, default)
 
-    async def preload_genres(self, language: str = DEFAULT_LANGUAGE):
+    async def _get_genres(self, language: str) -> dict[int, str]:
         json = await self._get_json(TMDB_GENRE_LIST_ENDPOINT, {"language": language})
         genres = json.get("genres")
         if not genres:
             raise RuntimeError("api didn't return valid genres list")
 
-        TMDBSession.__genres_table = {
+        return {
             id: name for g in genres if all([id := g.get("id"), name := g.get("name")])
         }
 
+    async def preload_genres(self):
+        tables = await asyncio.gather(
+            *(self._get_genres(language) for language in SUPPORTED_LANGUAGES)
+        )
+        TMDBSession.__genres_table = dict(zip(SUPPORTED_LANGUAGES, tables, strict=True))
+
     async def _get_json(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
         headers = {
             "accept": "application/json",
             "Authorization": f"Bearer {self.__token}",
         }
-        async with self.__session.get(endpoint, headers=headers, params=params) as resp:
-            code = resp.status
-            json = await resp.json()
-
-            if resp.ok:
-                logging.info("[GET %d] %s %r", code, endpoint, params)
-            else:
-                if resp.status == 404:
-                    return {}
-                logging.error("[GET %d] %s %r", code, endpoint, params)
-                logging.error("%s", json)
-                raise TMDBException(json.get("status"), json.get("message"))
-
-            return json
-
-    def _format_movie_poster(self, movie: dict[str, Any]):
-        if poster_path := movie.get("poster_path"):
-            movie["poster_path"] = TMDB_IMAGE_ENDPOINT.format(poster_path)
-        else:
-            movie["poster_path"] = POSTER_PLACEHOLDER_PATH
-        return movie
+        with span("tmdb", endpoint):
+            async with self.__session.get(
+                endpoint, headers=headers, params=params
+            ) as resp:
+                code = resp.status
+                body = await resp.read()
+                if body and resp.content_type != "application/json":
+                    raise aiohttp.ContentTypeError(
+                        resp.request_info,
+                        resp.history,
+                        status=code,
+                        message=f"unexpected mimetype: {resp.content_type}",
+                        headers=resp.headers,
+                    )
+                # resp.json() would decode the body to `str` first, and orjson
+                # is fastest on the raw bytes
+                json = loads(body) if body else {}
+
+                if resp.ok:
+                    logging.info("[GET %d] %s %r", code, endpoint, params)
+                else:
+                    if resp.status == 404:
+                        return {}
+                    logging.error("[GET %d] %s %r", code, endpoint, params)
+                    logging.error("%s", json)
+                    raise TMDBException(json.get("status"), json.get("message"), code)
+
+                return json
 
     def _is_results_valid(self, results: list[dict[str, Any]] | Any) -> bool:
         return bool(results) and isinstance(results, list) and bool(len(results))
 
-    def _filter_trailers(
-        self, results: list[dict[str, Any]] | None
-    ) -> list[dict[str, Any]]:
-        if not self._is_results_valid(results):
-            return []
-        return sorted(
-            [
-                video
-                for video in results  # type: ignore
-                if (type := video.get("type")) and type.lower() == "trailer"
-                if (site := video.get("site")) and site.lower() == "youtube"
-                if video.get("official")
-            ],
-            key=lambda video: video.get("size") or 0,
-            reverse=True,
-        )
-
-    def _trailer_from_results(self, results: list[dict[str, Any]] | None) -> str | None:
-        trailer_list = self._filter_trailers(results)
-        if not trailer_list:
-            return None
+    def _trailer_languages(self, id: int, language: str) -> list[str]:
+        if (id, language) in self.trailer_language_memo:
+            resolved = self.trailer_language_memo[id, language]
+            return [resolved] if resolved else []
+        if language == FALLBACK_LANGUAGE:
+            return [language]
+        return [language, FALLBACK_LANGUAGE]
+
+    def _video_params(self, variants: list[str]) -> dict[str, str]:
+        # every variant comes back in the one response, so trying the fallback
+        # language doesn't cost a second request
+        return {
+            "include_video_language": ",".join(
+                variant.split("-")[0] for variant in variants
+            )
+        }
 
-        key = trailer_list[0].get("key")
-        return f"https://youtube.com/watch?v={key}" if key else None
+    def _trailer_from_videos(
+        self, id: int, language: str, variants: list[str], results: Any
+    ) -> str | None:
+        for variant in variants:
+            if trailer := parse_trailer(results, variant):
+                self.trailer_language_memo[id, language] = variant
+                return trailer
+
+        if (id, language) in self.trailer_language_memo:
+            # the trailer is gone, look through every variant next time
+            self.trailer_language_memo.pop((id, language))
+        else:
+            self.trailer_language_memo[id, language] = None
+        return None
 
     async def get_movie_trailer(
         self, id: int, language: str = DEFAULT_LANGUAGE
     ) -> str | None:
+        if not (variants := self._trailer_languages(id, language)):
+            return None
+
         json = await self._get_json(
-            TMDB_VIDEOS_ENDPOINT.format(id), params={"language": language}
+            TMDB_VIDEOS_ENDPOINT.format(id),
+            params={"language": language} | self._video_params(variants),
         )
-        if (
-            not (trailer := self._trailer_from_results(json.get("results")))  # type: ignore
-            and language != "en-US"
-        ):
-            return await self.get_movie_trailer(id, language="en-US")
-
-        return trailer
+        return self._trailer_from_videos(id, language, variants, json.get("results"))
 
     async def get_movie_by_id(
         self, id: int, language: str = DEFAULT_LANGUAGE
     ) -> Movie | None:
-        json = await self._get_json(
-            TMDB_DETAILS_ENDPOINT.format(id),
-            params={"append_to_response": "videos", "language": language},
-        )
+        params = {"language": language}
+        if variants := self._trailer_languages(id, language):
+            params |= {"append_to_response": "videos"} | self._video_params(variants)
+
+        json = await self._get_json(TMDB_DETAILS_ENDPOINT.format(id), params=params)
 
-        if not json:
+        if not json or not (movie := MovieData.parse(json)):
             return None
 
-        if json.get("genres"):
-            json["genre_ids"] = list(
-                filter(lambda id: id is not None, [g.get("id") for g in json["genres"]])
+        if variants and isinstance(videos := json.get("videos"), dict):
+            movie.trailer = (
+                self._trailer_from_videos(
+                    movie.id, language, variants, videos.get("results")
+                )
+                or ""
             )
 
-        if (videos := json.get("videos")) and (results := videos.get("results")):
-            json["trailer"] = self._trailer_from_results(
-                results
-            ) or await self.get_movie_trailer(json["id"], language="en-US")
-
-        return await Movie.from_dict(self._format_movie_poster(json), False)
+        return await Movie.from_data(movie, False)
 
     async def search_movie(
         self, query: str, *, language: str = DEFAULT_LANGUAGE
@@ -147,10 +190,13 @@ class TMDBSession:
         results = json.get("results")
         if not all((self._is_results_valid(results), json.get("total_results"))):
             return None
-        movie = results[0]  # type: ignore
-        movie["trailer"] = await self.get_movie_trailer(movie["id"])
+        if not (movie := MovieData.parse(results[0])):  # type: ignore
+            return None
+        movie.trailer = await self.get_movie_trailer(movie.id, language) or ""
 
-        return await Movie.from_dict(self._format_movie_poster(movie))
+        saved = await Movie.from_data(movie)
+        await MovieTranslation.upsert([(saved, language)])
+        return saved
 
     async def get_trending_movies(
         self,
@@ -166,7 +212,9 @@ class TMDBSession:
             return None
 
         movies: list[Movie] = [
-            await Movie.from_dict(self._format_movie_poster(r))
+            await Movie.from_data(movie)
             for r in results  # type: ignore
+            if (movie := MovieData.parse(r))
         ]
+        await MovieTranslation.upsert((movie, language) for movie in movies)
         return movies
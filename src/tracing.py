@@ -0,0 +1,198 @@
+import cProfile
+import functools
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+from aiogram.types.update import UpdateTypeLookupError
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+slow_update_log = logging.getLogger("slow_updates")
+
+DB_CLIENT_METHODS = (
+    "execute_insert",
+    "execute_many",
+    "execute_query",
+    "execute_query_dict",
+    "execute_script",
+)
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    detail: str = ""
+    start: float = field(default_factory=time.perf_counter)
+    end: float | None = None
+    children: list["Span"] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def format(self, depth: int = 0) -> Iterator[str]:
+        yield f"{'  ' * depth}{self.duration * 1000:8.1f}ms {self.name} {self.detail}"
+        for child in self.children:
+            yield from child.format(depth + 1)
+
+
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(name: str, detail: str = "") -> Iterator[None]:
+    # a no-op outside of a traced update, e.g. in the favourites refresher
+    if (parent := current_span.get()) is None:
+        yield
+        return
+
+    child = Span(name, detail)
+    parent.children.append(child)
+    token = current_span.set(child)
+    try:
+        yield
+    finally:
+        child.end = time.perf_counter()
+        current_span.reset(token)
+
+
+class TracingMiddleware(BaseMiddleware):
+    def __init__(
+        self, slow_threshold: float, profile_rate: float, profile_dir: Path
+    ) -> None:
+        self.slow_threshold = slow_threshold
+        self.profile_rate = profile_rate
+        self.profile_dir = profile_dir
+        self.__profiling = False
+
+    def _start_profiler(self) -> cProfile.Profile | None:
+        # only one profiler can be active at a time, and it sees every update
+        # that's being handled concurrently, not just the sampled one
+        if self.__profiling or random.random() >= self.profile_rate:
+            return None
+        self.__profiling = True
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _dump_profile(self, profiler: cProfile.Profile, update: Update) -> None:
+        profiler.disable()
+        self.__profiling = False
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        path = self.profile_dir / f"update_{update.update_id}.prof"
+        profiler.dump_stats(path)
+        logging.info("Profiled update #%d into %s", update.update_id, path)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        assert isinstance(event, Update)
+
+        # unknown update types are only warned about by the dispatcher, which
+        # runs after this middleware, so this mustn't raise for them either
+        try:
+            event_type = event.event_type
+        except UpdateTypeLookupError:
+            event_type = "unknown"
+
+        root = Span("update", f"#{event.update_id} {event_type}")
+        token = current_span.set(root)
+        profiler = self._start_profiler()
+        try:
+            return await handler(event, data)
+        finally:
+            root.end = time.perf_counter()
+            current_span.reset(token)
+            if profiler:
+                self._dump_profile(profiler, event)
+            if root.duration * 1000 >= self.slow_threshold:
+                slow_update_log.warning(
+                    "Slow update (%.1fms):\n%s",
+                    root.duration * 1000,
+                    "\n".join(root.format()),
+                )
+
+
+class HandlerSpanMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object: HandlerObject | None = data.get("handler")
+        name = handler_object.callback.__name__ if handler_object else ""
+        with span("handler", name):
+            return await handler(event, data)
+
+
+class BotSpanMiddleware(BaseRequestMiddleware):
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        with span("bot", type(method).__name__):
+            return await make_request(bot, method)
+
+
+def _traced_query(
+    method: Callable[..., Awaitable[Any]],
+) -> Callable[..., Awaitable[Any]]:
+    @functools.wraps(method)
+    async def wrapper(self: BaseDBAsyncClient, query: str, *args, **kwargs) -> Any:
+        with span("db", " ".join(query.split())[:120]):
+            return await method(self, query, *args, **kwargs)
+
+    wrapper.__traced__ = True  # type: ignore
+    return wrapper
+
+
+def instrument_db(client: BaseDBAsyncClient) -> None:
+    # transactions (`get_or_create`, for one) run on a wrapper subclass of the
+    # client, so every subclass gets patched, not just this instance
+    pending = [type(client)]
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        for name in DB_CLIENT_METHODS:
+            method = cls.__dict__.get(name)
+            if method and not getattr(method, "__traced__", False):
+                setattr(cls, name, _traced_query(method))
+
+
+def setup_tracing(
+    dp: Dispatcher,
+    bot: Bot,
+    *,
+    slow_threshold: float,
+    profile_rate: float = 0.0,
+    profile_dir: Path = Path("profiles"),
+) -> None:
+    dp.update.outer_middleware(
+        TracingMiddleware(slow_threshold, profile_rate, profile_dir)
+    )
+    for observer in (dp.message, dp.callback_query, dp.error):
+        observer.middleware(HandlerSpanMiddleware())
+    bot.session.middleware(BotSpanMiddleware())
+    instrument_db(connections.get("default"))